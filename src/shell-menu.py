@@ -46,23 +46,20 @@ from subprocess import call
 import sys
 import termios
 import os
-import re
 
 # Import the sheel-menu libraries
 sys.path = ([sys.path[0] + "/shell-menu"] + sys.path)
 from menu import Menu
-from info import Info
+from page import Page
+from history import History
+from environment import replace_variables
 
 
 # Execute only in interactive mode
 if __name__ == "__main__":
 
-    # Empty boxes collection
-    boxes = []
-
-    # Dictionaries containing the configuration JSONs
+    # Dictionary containing the main configuration JSON
     main_conf = None
-    menu_conf = None
 
     # Open and load the main configuration JSON
     with open(sys.path[1] + "/cnf/shell-menu.json", "r") as configuration:
@@ -115,32 +112,64 @@ if __name__ == "__main__":
     if "exit_key" in main_conf:
         exit_key = main_conf["exit_key"]
 
+    # Back sequence to the default value and read from the configuration if
+    # defined by the user.
+    # The default back sequence is the simple "b" character
+    back_key = "b"
+    if "back_key" in main_conf:
+        back_key = main_conf["back_key"]
+
     # Remove environment variable into user configuration JSON and replace with
     # their values
-    for variable in re.findall("\$[A-Z|_]+",
-                               main_conf["configurations"][hostname][user]):
-        # Remove the dollar symbol from the variable name
-        variable = variable[1:]
-        # Replace each environment variable used
-        if variable in os.environ:
-            main_conf["configurations"][hostname][user] = re.sub(
-                "\$"+variable, os.environ[variable],
-                main_conf["configurations"][hostname][user])
-
-    # Open the specific configuration JSON indicated in the main configuration
-    with open(main_conf["configurations"][hostname][user]) as configuration:
-        menu_conf = json.load(configuration)
-        # Add all menu boxes
-        for menu in sorted(menu_conf["menu"].keys()):
-            boxes.append(Menu(menu_conf["menu"][menu]))
-        # Add all info boxes if any
-        if "info" in menu_conf:
-            for info in sorted(menu_conf["info"].keys()):
-                boxes.append(Info(menu_conf["info"][info]))
+    main_conf["configurations"][hostname][user] = replace_variables(
+        main_conf["configurations"][hostname][user])
+
+    # Usage history and "frequent" box configuration, read from the main
+    # configuration JSON if defined by the user.
+    # Without a "frequent" configuration no history is recorded
+    history = None
+    frequent_conf = {"title": "Frequent commands", "base": 100, "size": 5,
+                     "halflife": 7, "history": "~/.shell-menu-history"}
+    if "frequent" in main_conf:
+        frequent_conf.update(main_conf["frequent"])
+        # The halflife must be a positive number of days, otherwise the
+        # default value is used
+        if (not isinstance(frequent_conf["halflife"], (int, float)) or
+                frequent_conf["halflife"] <= 0):
+            frequent_conf["halflife"] = 7
+        # Replace environment variables used in the history file path
+        frequent_conf["history"] = replace_variables(frequent_conf["history"])
+        history = History(os.path.expanduser(frequent_conf["history"]),
+                          frequent_conf["halflife"])
+        history.load()
+
+    # Load only the top level page from the specific configuration JSON
+    # indicated in the main configuration, submenus will be loaded when the
+    # user enter into them for the first time
+    pages = [Page("", path=main_conf["configurations"][hostname][user])]
+    pages[0].load()
+
+    # Indexes that the "frequent" box must not use, to avoid collisions with
+    # the entries of the top level page and with the exit and back sequences
+    reserved = pages[0].get_indexes() | set([exit_key, back_key])
 
     # Till the end of the world... or the user insert the exit choice :)
     while True:
 
+        # Boxes of the current page (last opened submenu)
+        # The top level page shows the "frequent" box as first box, built
+        # from the commands with the highest score in the usage history
+        boxes = pages[-1].boxes
+        frequent_box = None
+        if history and len(pages) == 1:
+            frequent = history.get_frequent(frequent_conf["size"])
+            if frequent:
+                frequent_box = Menu({"title": frequent_conf["title"],
+                                     "base": frequent_conf["base"],
+                                     "skip": reserved,
+                                     "commands": frequent})
+                boxes = [frequent_box] + boxes
+
         # Reset each box index
         for box in boxes:
             box.index = 0
@@ -148,8 +177,10 @@ if __name__ == "__main__":
         # Call to clear screen
         call("clear")
 
-        # Print the menu global title (main configuration JSON)
-        print(("\n"*vmargin) + (' '*hmargin) + menu_conf["title"], end="\n\n")
+        # Print the breadcrumb of the opened pages, starting from the menu
+        # global title (user configuration JSON)
+        print(("\n"*vmargin) + (' '*hmargin) +
+              " > ".join([page.title for page in pages]), end="\n\n")
 
         # Print, line by line, every box (menu box before, info box after)
         completed = 0
@@ -166,8 +197,15 @@ if __name__ == "__main__":
             print('', end="\n")
 
         # Ask the user for the index of the command to execute
-        question = ("{0}{1}@{2} make your choice [ \"{3}\" to exit ] : ".
-                    format((' '*hmargin), getuser(), gethostname(), exit_key))
+        if len(pages) > 1:
+            question = ("{0}{1}@{2} make your choice [ \"{3}\" to exit, "
+                        "\"{4}\" to go back ] : ".
+                        format((' '*hmargin), getuser(), gethostname(),
+                               exit_key, back_key))
+        else:
+            question = ("{0}{1}@{2} make your choice [ \"{3}\" to exit ] : ".
+                        format((' '*hmargin), getuser(), gethostname(),
+                               exit_key))
         if sys.version_info[0] == 2:
             choice = raw_input(question)
         elif sys.version_info[0] == 3:
@@ -175,22 +213,68 @@ if __name__ == "__main__":
         if choice == exit_key:
             call("clear")
             exit()
+        elif choice == back_key and len(pages) > 1:
+            pages.pop()
         else:
-            found = 0
-            # Check each menu box if there is a command with the inserted index
-            for box in boxes:
-                if isinstance(box, Menu):
-                    command = box.get_command(choice)
+            # Open the submenu with the inserted index if any, reading its
+            # content on the first access
+            # A submenu that cannot be read doesn't stop the shell-menu
+            try:
+                submenu = pages[-1].get_submenu(choice)
+                if submenu:
+                    submenu.load()
+            except (IOError, OSError, ValueError, KeyError, TypeError):
+                submenu = False
+            if submenu:
+                pages.append(submenu)
+                continue
+            elif submenu is False:
+                print()
+                print("{0}\"{1}\" cannot be opened".
+                      format((' '*hmargin), choice), end="\n\n")
+            else:
+                found = 0
+                # Check each menu box if there is a command with the inserted
+                # index
+                for box in boxes:
+                    if not isinstance(box, Menu):
+                        continue
+                    index = choice
+                    location = pages[-1].location + [choice]
+                    # Entries of the "frequent" box come from the history
+                    # file, so they are executed from the menu box that still
+                    # contains the same command at their location
+                    if box is frequent_box and choice in box.links:
+                        frequent_command = box.links[choice]
+                        location = history.locations[frequent_command]
+                        index = location[-1]
+                        try:
+                            box = pages[0].get_entry(location,
+                                                     frequent_command)
+                        except (IOError, OSError, ValueError, KeyError,
+                                TypeError):
+                            box = None
+                        if box is None:
+                            found = 1
+                            history.remove(frequent_command)
+                            print()
+                            print("{0}\"{1}\" is not available anymore".
+                                  format((' '*hmargin), choice), end="\n\n")
+                            continue
+                    command = box.get_command(index)
                     if command:
                         found = 1
+                        if history:
+                            history.record(box.names[index], box.links[index],
+                                           location)
                         call("clear")
                         # Execution of the command
                         call(command)
-            # Command not found in any menu box
-            if not found:
-                print()
-                print("{0}\"{1}\" is not a valid choice".
-                      format((' '*hmargin), choice), end="\n\n")
+                # Command not found in any menu box
+                if not found:
+                    print()
+                    print("{0}\"{1}\" is not a valid choice".
+                          format((' '*hmargin), choice), end="\n\n")
 
             # Print the 'go back' message and wait until the user press the
             # ENTER button to continue
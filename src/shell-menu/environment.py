@@ -0,0 +1,64 @@
+
+"""shell-menu is a simplified menu for shell environment.
+
+Description:
+    The main target of the project is to provide an easy to deploy menu to use
+    in shell mode, for example in case of remote SSH connection, that allows
+    the user to easily execute a set of command.
+
+    The configuration is based on two JSON format files. The first must be
+    located in a subdirectory called 'cnf' inside the shell-menu.py directory.
+    The second one can be saved in any directory of the system where the user
+    that will execute the shell-menu.py has the read grants.
+
+    First configuration file is the main one, and the name must be
+    "shell-menu.json". The user is free to choose a name for the second one.
+
+Author:
+    Giuseppe Biolo  < giuseppe.biolo@gmail.com > < https://github.com/gbiolo >
+
+License:
+    This file is part of shell-menu.
+
+    shell-menu is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    shell-menu is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with shell-menu. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+
+import re
+import os
+import sys
+
+
+# Type of the strings decoded from the JSON files, that for Python 2.6+ may be
+# both "str" and "unicode"
+if sys.version_info[0] == 2:
+    string_types = basestring
+else:
+    string_types = str
+
+
+def replace_variables(string):
+    """Function that replace the environment variables used in a string.
+
+    The environment variables are indicated as usual with a "$" followed by
+    the variable name. Variables not defined in the environment are left
+    unchanged. The return value is the string with the replaced values.
+    """
+    for variable in re.findall("\$[A-Z|_]+", string):
+        # Remove the dollar symbol from the variable name
+        variable = variable[1:]
+        # Replace each environment variable used
+        if variable in os.environ:
+            string = re.sub("\$"+variable, os.environ[variable], string)
+    return string
@@ -0,0 +1,254 @@
+
+"""shell-menu is a simplified menu for shell environment.
+
+Description:
+    The main target of the project is to provide an easy to deploy menu to use
+    in shell mode, for example in case of remote SSH connection, that allows
+    the user to easily execute a set of command.
+
+    The configuration is based on two JSON format files. The first must be
+    located in a subdirectory called 'cnf' inside the shell-menu.py directory.
+    The second one can be saved in any directory of the system where the user
+    that will execute the shell-menu.py has the read grants.
+
+    First configuration file is the main one, and the name must be
+    "shell-menu.json". The user is free to choose a name for the second one.
+
+Author:
+    Giuseppe Biolo  < giuseppe.biolo@gmail.com > < https://github.com/gbiolo >
+
+License:
+    This file is part of shell-menu.
+
+    shell-menu is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    shell-menu is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with shell-menu. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+
+import json
+import numbers
+import time
+import tempfile
+import fcntl
+import stat
+import os
+
+# Import the sheel-menu libraries
+from environment import string_types
+
+
+class History:
+    """Class that rappresent the usage history of the shell-menu commands.
+
+    The history is saved in an append-only file, one JSON array per line with
+    the format [weight, time, name, command, location]. Every executed command
+    appends a line with weight 1, and the compaction replaces all lines with a
+    single line for each command, reporting its score as weight.
+    The location is the array of the indexes of the submenus opened from the
+    top level menu to reach the command, followed by the command index.
+    The score of a command is its frecency: each execution counts 1 at the
+    moment it happens, and its value halves every "halflife" days.
+    """
+
+    def __init__(self, path, halflife=7, threshold=1000):
+        """Initialization of an empty history, without reading the file.
+
+        The generic attributes are:
+            path      : path of the history file
+            halflife  : days needed to halve the score of an execution
+            threshold : number of lines appended after the last compaction
+                        that causes a new compaction during the load
+            now       : reference time of the scores, set during the load
+            scores    : dictionary with the commands as keys and their scores
+                        (at the reference time) as values
+            names     : dictionary with the commands as keys and the last name
+                        used for them as values
+            locations : dictionary with the commands as keys and the last
+                        location used for them as values
+            lines     : number of lines in the history file
+            offset    : position of the end of the history file at the load
+            inode     : inode of the history file at the load
+        """
+        self.path = path
+        self.halflife = halflife
+        self.threshold = threshold
+        self.now = time.time()
+        self.scores = {}
+        self.names = {}
+        self.locations = {}
+        self.lines = 0
+        self.offset = 0
+        self.inode = None
+
+    def add(self, weight, when, name, command, location):
+        """Method that add to the scores an execution, or a compacted score.
+
+        The weight is scaled to the reference time, so the scores of all
+        commands can be compared without recalculating them.
+        """
+        weight *= 2 ** ((when - self.now) / (self.halflife * 86400.0))
+        self.scores[command] = self.scores.get(command, 0) + weight
+        self.names[command] = name
+        self.locations[command] = location
+
+    def add_line(self, line):
+        """Method that add to the scores a line of the history file.
+
+        Lines that cannot be decoded, with values of the wrong type, or with a
+        time too far from the reference time to be scaled, are skipped.
+        """
+        try:
+            weight, when, name, command, location = json.loads(line)
+            if (isinstance(weight, numbers.Real) and
+                    isinstance(when, numbers.Real) and
+                    isinstance(name, string_types) and
+                    isinstance(command, string_types) and
+                    isinstance(location, list) and location and
+                    all([isinstance(index, string_types)
+                         for index in location])):
+                self.add(weight, when, name, command, location)
+        except (ValueError, TypeError, OverflowError):
+            pass
+
+    def open_locked(self, mode, operation=fcntl.LOCK_EX):
+        """Method that open the history file and lock it.
+
+        The lock is released when the returned file is closed. If another
+        session replaced the history file while waiting for the lock, the new
+        history file is opened and locked, so no line is written to a file
+        that has already been replaced.
+        """
+        while True:
+            history = open(self.path, mode)
+            try:
+                fcntl.flock(history.fileno(), operation)
+                if (os.fstat(history.fileno()).st_ino ==
+                        os.stat(self.path).st_ino):
+                    return history
+            except (IOError, OSError):
+                history.close()
+                raise
+            history.close()
+
+    def load(self):
+        """Method that read the history file and calculate all the scores.
+
+        A missing history file is considered empty. If too many lines have
+        been appended after the last compaction, the history file will be
+        compacted.
+        """
+        self.now = time.time()
+        self.scores = {}
+        self.names = {}
+        self.locations = {}
+        self.lines = 0
+        try:
+            with self.open_locked("r", fcntl.LOCK_SH) as history:
+                for line in iter(history.readline, ""):
+                    self.lines += 1
+                    self.add_line(line)
+                # Position and identity of the file read, used by the
+                # compaction to find the lines appended by other sessions
+                self.offset = history.tell()
+                self.inode = os.fstat(history.fileno()).st_ino
+        except (IOError, OSError):
+            return
+        if (self.lines - len(self.scores)) > self.threshold:
+            self.compact()
+
+    def record(self, name, command, location):
+        """Method that append a new execution of a command to the history.
+
+        The score of the command is updated too, so the history file is never
+        read again during the session. Errors writing the history file are
+        ignored: the history must not stop the execution of the commands.
+        """
+        when = time.time()
+        self.add(1, when, name, command, location)
+        try:
+            with self.open_locked("a") as history:
+                history.write(json.dumps([1, when, name, command,
+                                          location]) + "\n")
+            self.lines += 1
+        except (IOError, OSError):
+            pass
+
+    def compact(self):
+        """Method that rewrite the history file with one line for command.
+
+        It must be called after the load. Commands with a negligible score
+        (not executed for more than ten halflife periods) are removed from the
+        history. The new file is written in a temporary file of the same
+        directory, with the permissions of the history file, and then renamed
+        holding the lock of the history file, so the file is never left
+        incomplete and no line appended by other sessions is lost.
+        Lines appended by other sessions after the load are copied at the end
+        of the new file. If another session already replaced the history file
+        with a compacted one, the compaction is abandoned.
+        """
+        for command in list(self.scores.keys()):
+            if self.scores[command] < 0.001:
+                self.remove(command)
+        temp_path = None
+        try:
+            with self.open_locked("r") as history:
+                if os.fstat(history.fileno()).st_ino != self.inode:
+                    return
+                descriptor, temp_path = tempfile.mkstemp(
+                    dir=os.path.dirname(os.path.abspath(self.path)))
+                with os.fdopen(descriptor, "w") as compacted:
+                    for command in self.scores:
+                        compacted.write(json.dumps([self.scores[command],
+                                                    self.now,
+                                                    self.names[command],
+                                                    command,
+                                                    self.locations[command]]) +
+                                        "\n")
+                    lines = len(self.scores)
+                    history.seek(self.offset)
+                    for line in iter(history.readline, ""):
+                        compacted.write(line)
+                        lines += 1
+                        self.add_line(line)
+                os.chmod(temp_path,
+                         stat.S_IMODE(os.fstat(history.fileno()).st_mode))
+                os.rename(temp_path, self.path)
+                temp_path = None
+            self.lines = lines
+        except (IOError, OSError):
+            if temp_path and os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def remove(self, command):
+        """Method that remove a command from the scores.
+
+        The command is removed from the history file at the next compaction.
+        """
+        del self.scores[command]
+        del self.names[command]
+        del self.locations[command]
+
+    def get_frequent(self, size):
+        """Method that return the commands with the highest scores.
+
+        The return value is an array, ordered by score, of at most "size"
+        dictionaries with the keys "name", "command" and "location", the same
+        format used for the commands of the user configuration JSON.
+        The history file can be changed by the user, so the caller must check
+        that the command is still at its location before executing it.
+        """
+        commands = sorted(self.scores.keys(), key=self.scores.get,
+                          reverse=True)[:size]
+        return [{"name": self.names[command], "command": command,
+                 "location": self.locations[command]}
+                for command in commands]
@@ -36,10 +36,10 @@ License:
 
 
 import re
-import os
 
 # Import the sheel-menu libraries
 from box import Box
+from environment import replace_variables
 
 
 class Menu(Box):
@@ -51,25 +51,42 @@ class Menu(Box):
         The initialization add to the box the attribute "links", a dictionary
         containing all commands indicated into the user configuration JSON.
         The dictionary uses as keys the indexes of the commands, and as values
-        the commands to execute (expressed as single string)
+        the commands to execute (expressed as single string).
+        Entries with a "submenu" key instead of a "command" key are collected
+        into the attribute "submenus", using the same indexes, and are marked
+        with a trailing ">" in the box.
+        The attribute "names" contains the names of the commands, with the
+        same indexes of "links".
+        The optional "skip" array of the configuration contains indexes that
+        must not be used: entries go on with the next free index
         """
         # Initialization of the base object
         Box.__init__(self)
         self.title = configuration["title"]
         # Empty dictionary initialization
         self.links = {}
-        # External commands index string maximum length
+        self.submenus = {}
+        self.names = {}
+        # Indexes of the entries, starting from the base and jumping the
+        # indexes to skip
         commands = configuration["commands"]
-        num_commands = len(commands)
+        indexes = []
+        index = configuration["base"]
+        skip = configuration.get("skip", [])
+        for command in commands:
+            while str(index) in skip:
+                index += 1
+            indexes.append(str(index))
+            index += 1
+        # External commands index string maximum length
         index_length = 1
-        while num_commands >= 10:
-            index_length += 1
-            num_commands = int(num_commands / 10)
+        if indexes:
+            index_length = max([len(index) for index in indexes])
         # Box size, calculated on length of menu name and on length of all
         # command names
         header_length = len(self.title) + 2
         for command in commands:
-            command_length = (len(command["name"]) + index_length + 4)
+            command_length = (len(Menu.label(command)) + index_length + 4)
             if command_length > header_length:
                 header_length = command_length
         self.size = (header_length + 3)
@@ -77,15 +94,40 @@ class Menu(Box):
         # Create all menu rows that will be inserted into the array "rows"
         # Then header indicating the box name will be added by the base class
         # Then closing line will be added by the base class too
-        index = configuration["base"]
-        for command in commands:
-            self.rows.append("| " + "{0}) {1} ".format(str(index).rjust(
-                             index_length), command["name"]).ljust(
+        for index, command in zip(indexes, commands):
+            self.rows.append("| " + "{0}) {1} ".format(index.rjust(
+                             index_length), Menu.label(command)).ljust(
                              header_length) + "|")
-            self.links[str(index)] = command["command"]
-            index += 1
+            if "submenu" in command:
+                self.submenus[index] = command
+            else:
+                self.links[index] = command["command"]
+                self.names[index] = command["name"]
         self.rows.append("+-" + ('-'*header_length) + "+")
 
+    @staticmethod
+    def label(command):
+        """Method that return the name to show in the box for an entry.
+
+        Entries that open a submenu are marked with a trailing ">".
+        """
+        if "submenu" in command:
+            return command["name"] + " >"
+        return command["name"]
+
+    def get_submenu(self, index):
+        """Method that return the submenu entry with the passed index.
+
+        The returned value is the whole entry dictionary from the user
+        configuration JSON, the "submenu" key contains an inline submenu
+        definition or the path of the JSON file that defines it.
+        If no submenu has the passed index, the method will return the value
+        "None".
+        """
+        if index in self.submenus:
+            return self.submenus[index]
+        return None
+
     def get_command(self, index):
         """Method that return an array containing the command to execute.
 
@@ -99,14 +141,7 @@ class Menu(Box):
         the passed index).
         """
         if index in self.links:
-            for variable in re.findall("\$[A-Z|_]+", self.links[index]):
-                # Remove the dollar symbol from the variable name
-                variable = variable[1:]
-                # Replace each environment variable used
-                if variable in os.environ:
-                    self.links[index] = re.sub("\$"+variable,
-                                               os.environ[variable],
-                                               self.links[index])
+            self.links[index] = replace_variables(self.links[index])
             # Split the command and return
             return re.split("\s+", self.links[index])
         return None
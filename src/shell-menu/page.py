@@ -0,0 +1,182 @@
+
+"""shell-menu is a simplified menu for shell environment.
+
+Description:
+    The main target of the project is to provide an easy to deploy menu to use
+    in shell mode, for example in case of remote SSH connection, that allows
+    the user to easily execute a set of command.
+
+    The configuration is based on two JSON format files. The first must be
+    located in a subdirectory called 'cnf' inside the shell-menu.py directory.
+    The second one can be saved in any directory of the system where the user
+    that will execute the shell-menu.py has the read grants.
+
+    First configuration file is the main one, and the name must be
+    "shell-menu.json". The user is free to choose a name for the second one.
+
+Author:
+    Giuseppe Biolo  < giuseppe.biolo@gmail.com > < https://github.com/gbiolo >
+
+License:
+    This file is part of shell-menu.
+
+    shell-menu is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    shell-menu is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with shell-menu. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+
+import json
+import os
+
+# Import the sheel-menu libraries
+from environment import replace_variables, string_types
+from menu import Menu
+from info import Info
+
+
+class Page:
+    """Class that rappresent a page of the shell-menu.
+
+    A page is the set of boxes shown together on the screen: the top level
+    menu defined by the user configuration JSON, or a submenu opened from one
+    of its entries.
+    """
+
+    def __init__(self, title, content=None, path=None):
+        """Initialization of a page, without reading or creating its boxes.
+
+        The page content can be passed as a dictionary ("content" argument),
+        with the same structure of the user configuration JSON, or as the path
+        of the JSON file that contains it ("path" argument).
+        The generic attributes are:
+            title    : title of the page, replaced by the "title" value of the
+                       content if defined
+            content  : dictionary with the "menu" and "info" definitions
+            path     : path of the JSON file of the content, or of the JSON
+                       file in which the content is defined inline, if any
+            boxes    : array of the boxes of the page, None until first load
+            children : dictionary of the submenu pages already opened, with
+                       the index of the menu entry as key
+            location : array of the indexes of the submenus opened from the
+                       top level page to reach this page
+        """
+        self.title = title
+        self.content = content
+        self.path = path
+        self.boxes = None
+        self.children = {}
+        self.location = []
+
+    def load(self):
+        """Method that read the page content and create all its boxes.
+
+        The JSON file, if any, is read only on the first call and the boxes
+        are kept for the following calls, so each submenu is read and laid
+        out only when the user enter into it for the first time.
+        Errors reading the JSON file or creating the boxes are raised to the
+        caller, and the page remains not loaded. A content without a "menu"
+        dictionary raises a ValueError.
+        """
+        if self.boxes is not None:
+            return
+        content = self.content
+        if content is None:
+            with open(self.path) as configuration:
+                content = json.load(configuration)
+        if (not isinstance(content, dict) or
+                not isinstance(content.get("menu"), dict) or
+                not isinstance(content.get("info", {}), dict)):
+            raise ValueError("Invalid content for page " + self.title)
+        boxes = []
+        # Add all menu boxes
+        for menu in sorted(content["menu"].keys()):
+            boxes.append(Menu(content["menu"][menu]))
+        # Add all info boxes if any
+        if "info" in content:
+            for info in sorted(content["info"].keys()):
+                boxes.append(Info(content["info"][info]))
+        self.content = content
+        self.boxes = boxes
+        if "title" in content:
+            self.title = content["title"]
+
+    def get_indexes(self):
+        """Method that return the indexes used by the menu boxes of the page.
+
+        The return value is a set containing the indexes of both commands and
+        submenus. The page must be already loaded.
+        """
+        indexes = set()
+        for box in self.boxes:
+            if isinstance(box, Menu):
+                indexes.update(box.links.keys())
+                indexes.update(box.submenus.keys())
+        return indexes
+
+    def get_submenu(self, index):
+        """Method that return the page of the submenu with the passed index.
+
+        The submenu page is created on the first request and kept in the
+        "children" dictionary for the rest of the session. The returned page
+        is not loaded yet.
+        If the submenu is defined in another JSON file, environment variables
+        used in its path are replaced by their values, and a relative path is
+        considered relative to the directory of the current page JSON file.
+        If no menu box has a submenu with the passed index, the method will
+        return the value "None". A submenu that is neither a dictionary nor a
+        path raises a ValueError.
+        """
+        if index in self.children:
+            return self.children[index]
+        for box in self.boxes:
+            if isinstance(box, Menu):
+                entry = box.get_submenu(index)
+                if entry:
+                    break
+        else:
+            return None
+        if isinstance(entry["submenu"], dict):
+            child = Page(entry["name"], content=entry["submenu"],
+                         path=self.path)
+        elif isinstance(entry["submenu"], string_types):
+            path = replace_variables(entry["submenu"])
+            if not os.path.isabs(path) and self.path:
+                path = os.path.join(os.path.dirname(self.path), path)
+            child = Page(entry["name"], path=path)
+        else:
+            raise ValueError("Invalid submenu " + index)
+        child.location = self.location + [index]
+        self.children[index] = child
+        return child
+
+    def get_entry(self, location, command):
+        """Method that return the menu box containing a command.
+
+        The location is the array of the indexes of the submenus to open from
+        this page, followed by the index of the command; the submenus are
+        loaded if needed, raising their errors to the caller.
+        The box is returned only if the command at the location is still the
+        passed one (with environment variables replaced), otherwise the method
+        will return the value "None".
+        """
+        page = self
+        for index in location[:-1]:
+            page = page.get_submenu(index)
+            if page is None:
+                return None
+            page.load()
+        for box in page.boxes:
+            if isinstance(box, Menu) and location[-1] in box.links:
+                if replace_variables(box.links[location[-1]]) == command:
+                    return box
+        return None